@@ -0,0 +1,111 @@
+import time
+from array import array
+
+# Candles are kept per (pair, timeframe) in fixed-size ring buffers backed by
+# one float array per field, so memory is bounded and each tick is O(1).
+
+TIMEFRAMES = {"1s": 1, "1m": 60, "5m": 300, "1h": 3600}
+CANDLE_CAPACITY = 1000  # candles kept per pair and timeframe
+FIELDS = ("t", "o", "h", "l", "c", "v")
+
+
+class CandleRing:
+    """Ring buffer of candles (t, o, h, l, c, v) for one timeframe."""
+
+    def __init__(self, seconds: int, capacity: int = CANDLE_CAPACITY):
+        self.seconds = seconds
+        self.capacity = capacity
+        self.t = array("d", [0.0]) * capacity
+        self.o = array("d", [0.0]) * capacity
+        self.h = array("d", [0.0]) * capacity
+        self.l = array("d", [0.0]) * capacity
+        self.c = array("d", [0.0]) * capacity
+        self.v = array("d", [0.0]) * capacity
+        self.head = -1  # index of the newest candle
+        self.count = 0
+
+    def update(self, ts: float, price: float, volume: float = 0.0) -> bool:
+        """Fold one tick into the current candle or open a new one.
+
+        Ticks older than the newest candle are ignored. Returns True if the
+        tick was applied.
+        """
+        bucket = float(int(ts // self.seconds) * self.seconds)
+        i = self.head
+        if self.count and bucket == self.t[i]:
+            if price > self.h[i]:
+                self.h[i] = price
+            if price < self.l[i]:
+                self.l[i] = price
+            self.c[i] = price
+            self.v[i] += volume
+            return True
+        if self.count and bucket < self.t[i]:
+            return False
+
+        i = self.head = (self.head + 1) % self.capacity
+        self.t[i] = bucket
+        self.o[i] = self.h[i] = self.l[i] = self.c[i] = price
+        self.v[i] = volume
+        self.count = min(self.count + 1, self.capacity)
+        return True
+
+    def latest(self) -> list[float] | None:
+        if not self.count:
+            return None
+        i = self.head
+        return [self.t[i], self.o[i], self.h[i], self.l[i], self.c[i], self.v[i]]
+
+    def columns(self, limit: int | None = None) -> dict:
+        """Newest `limit` candles, oldest first, as one list per field."""
+        n = self.count if limit is None else max(0, min(limit, self.count))
+        start = (self.head - n + 1) % self.capacity
+        out = {}
+        for name in FIELDS:
+            buf = getattr(self, name)
+            if start + n <= self.capacity:
+                out[name] = buf[start : start + n].tolist()
+            else:
+                out[name] = buf[start:].tolist() + buf[: start + n - self.capacity].tolist()
+        return out
+
+
+class CandleAggregator:
+    """Builds candles for every timeframe from a mid-price / last-trade stream.
+
+    `v` sums the volume passed to ingest(). The mid-price feed passes none, so
+    it stays 0 until a trade source is wired in.
+    """
+
+    def __init__(self, capacity: int = CANDLE_CAPACITY):
+        self.capacity = capacity
+        self.series: dict[str, dict[str, CandleRing]] = {}
+
+    def _rings(self, pair: str) -> dict[str, CandleRing]:
+        rings = self.series.get(pair)
+        if rings is None:
+            rings = {
+                tf: CandleRing(seconds, self.capacity)
+                for tf, seconds in TIMEFRAMES.items()
+            }
+            self.series[pair] = rings
+        return rings
+
+    def ingest(
+        self, pair: str, price: float, volume: float = 0.0, ts: float | None = None
+    ) -> dict[str, list[float]]:
+        """Apply one tick to every timeframe; returns the updated candle per timeframe."""
+        ts = time.time() if ts is None else ts
+        updated = {}
+        for tf, ring in self._rings(pair).items():
+            if ring.update(ts, price, volume):
+                updated[tf] = ring.latest()
+        return updated
+
+    def candles(self, pair: str, timeframe: str, limit: int | None = None) -> dict:
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"timeframe must be one of {', '.join(TIMEFRAMES)}")
+        rings = self.series.get(pair)
+        if rings is None:
+            return {name: [] for name in FIELDS}
+        return rings[timeframe].columns(limit)
@@ -4,7 +4,8 @@ import hashlib
 import json
 import asyncio
 import uuid
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from collections import deque
+from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
@@ -16,12 +17,17 @@ from utils import (
     exit_all_positions,
     get_active_position,
     placeOrder,
+    coindcx_signed_post,
     COINDCX_API_KEY,
     COINDCX_API_SECRET,
     ORDERBOOK_URL_COINDCX,
     CANCEL_ORDER_COINDCX,
     BASE_URL_COINDCX,
+    BASE_URL_DELTA,
+    DELTA_SYMBOL,
 )
+from venues import CoinDCXVenue, DeltaVenue, SmartRouter
+from candles import CandleAggregator, TIMEFRAMES
 import requests
 
 load_dotenv()
@@ -63,8 +69,75 @@ class ScheduledTradeRequest(BaseModel):
     execute_at: str  # ISO format: "2026-02-16T00:30:00" (local time)
 
 
+class RoutedOrderRequest(BaseModel):
+    side: str  # "buy" or "sell"
+    quantity: float
+    leverage: int = 15
+    dry_run: bool = False  # only return the routing plan
+
+
 # ---------- Scheduled trades store ----------
 scheduled_trades: list[dict] = []
+SCHEDULE_RECENT = 20  # finished trades kept in /ws/schedule snapshots
+_finished_trades: deque = deque(maxlen=SCHEDULE_RECENT)
+
+
+# ---------- Smart order router ----------
+def _router_venues() -> list:
+    """CoinDCX, plus Delta when DELTA_BASE_URL (live) and DELTA_SYMBOL are set."""
+    venues = [CoinDCXVenue()]
+    if BASE_URL_DELTA and not DELTA_SYMBOL:
+        print("DELTA_SYMBOL is not set; Delta excluded from routing")
+    elif BASE_URL_DELTA:
+        delta = DeltaVenue(BASE_URL_DELTA, DELTA_SYMBOL)
+        if delta.testnet:
+            print("DELTA_BASE_URL is a testnet endpoint; Delta excluded from routing")
+        else:
+            venues.append(delta)
+    return venues
+
+
+router = SmartRouter(_router_venues())
+
+
+# ---------- Candles ----------
+CANDLE_PAIR = "B-RIVER_USDT"
+
+candles = CandleAggregator()
+
+
+# ---------- Orderbook sampler ----------
+# One CoinDCX orderbook poller feeds /ws/orderbook and the candle aggregator.
+ORDERBOOK_POLL_ACTIVE = 0.25  # seconds, while orderbook/candle streams are open
+ORDERBOOK_POLL_IDLE = 1.0  # seconds otherwise, keeping candle history going
+ORDERBOOK_TIMEOUT = 2.0  # seconds before an orderbook sample is abandoned
+
+_latest_orderbook: dict | None = None  # last frame sent to /ws/orderbook
+
+
+# ---------- Stream refresh state ----------
+# Positions/orders streams poll CoinDCX on an adaptive interval: fast right
+# after a local trading action, backing off while nothing changes.
+REFRESH_FAST = 0.25  # seconds, used inside the fast window
+REFRESH_BASE = 1.0  # seconds, used after a change
+REFRESH_MAX = 8.0  # seconds, ceiling for idle backoff
+FAST_WINDOW = 10.0  # seconds of fast polling after an order/cancel/exit
+
+_last_trade_action = 0.0
+_stream_wakeups: set[asyncio.Event] = set()
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+# ---------- WebSocket client state ----------
+# Each connection gets a bounded outbound queue drained by its own sender task.
+WS_QUEUE_SIZE = 4  # event frames buffered per client before resyncing
+WS_SEND_TIMEOUT = 5.0  # seconds a single send may take before the client is dropped
+WS_MAX_LAG = 20  # frames dropped since the last completed send before dropping
+
+_ws_clients: set["_StreamClient"] = set()
+_schedule_clients: set["_StreamClient"] = set()
+_candle_clients: dict["_StreamClient", dict] = {}  # client -> {"timeframe": ...}
+_orderbook_clients: set["_StreamClient"] = set()
 
 
 # ---------- Helper: wait_until (unchanged) ----------
@@ -103,7 +176,6 @@ def _execute_order(
     side: str, quantity: float, order_type: str, price: float | None, leverage: int
 ):
     """Shared logic to place an order on CoinDCX."""
-    secret_bytes = bytes(COINDCX_API_SECRET, encoding="utf-8")
     timeStamp = int(round(time.time() * 1000))
 
     order_body = {
@@ -119,17 +191,79 @@ def _execute_order(
 
     body = {"timestamp": timeStamp, "order": order_body}
 
-    json_body = json.dumps(body, separators=(",", ":"))
-    signature = hmac.new(secret_bytes, json_body.encode(), hashlib.sha256).hexdigest()
+    response = coindcx_signed_post(BASE_URL_COINDCX, body)
+    return response.json()
 
-    headers = {
-        "Content-Type": "application/json",
-        "X-AUTH-APIKEY": COINDCX_API_KEY,
-        "X-AUTH-SIGNATURE": signature,
-    }
 
-    response = requests.post(BASE_URL_COINDCX, data=json_body, headers=headers)
-    return response.json()
+# ---------- Helper: stream refresh ----------
+def _wake_streams():
+    for event in _stream_wakeups:
+        event.set()
+
+
+def _notify_trade_action():
+    """Mark a local order/cancel/exit and wake every positions/orders stream.
+
+    Called from sync endpoints (threadpool), so the wakeup is handed to the
+    event loop thread-safely.
+    """
+    global _last_trade_action
+    _last_trade_action = time.monotonic()
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_wake_streams)
+
+
+def _next_interval(interval: float, changed: bool) -> float:
+    """Refresh interval after a poll: fast window > reset on change > backoff."""
+    if time.monotonic() - _last_trade_action < FAST_WINDOW:
+        return REFRESH_FAST
+    if changed:
+        return REFRESH_BASE
+    return min(max(interval, REFRESH_BASE) * 2, REFRESH_MAX)
+
+
+def _content_hash(payload: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+async def _wait_refresh(wakeup: asyncio.Event, interval: float):
+    """Sleep for `interval` or until a local trading action wakes the stream."""
+    try:
+        await asyncio.wait_for(wakeup.wait(), timeout=interval)
+    except asyncio.TimeoutError:
+        pass
+    wakeup.clear()
+
+
+# ---------- Helper: schedule events ----------
+def _schedule_snapshot() -> dict:
+    """Active trades plus the last SCHEDULE_RECENT finished ones.
+
+    Bounded regardless of history, and a resync after dropped events still
+    carries the final status of trades that just finished.
+    """
+    active = [t for t in scheduled_trades if t["status"] in ("pending", "executing")]
+    data = list(_finished_trades) + active
+    return {"success": True, "type": "snapshot", "data": data}
+
+
+def _broadcast_schedule(frame: dict):
+    for client in list(_schedule_clients):
+        client.push(frame)
+
+
+def _publish_schedule(event: str, trade: dict):
+    """Push a scheduled-trade state change to every /ws/schedule client.
+
+    Safe to call from sync endpoints (threadpool) as well as the event loop.
+    """
+    if event in ("executed", "failed", "cancelled"):
+        _finished_trades.append(trade)
+    frame = {"success": True, "type": event, "data": dict(trade)}
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_broadcast_schedule, frame)
 
 
 # ---------- Background task: scheduled trade runner ----------
@@ -142,8 +276,10 @@ async def _scheduled_trade_runner():
                 execute_at = datetime.fromisoformat(trade["execute_at"])
                 if now >= execute_at:
                     trade["status"] = "executing"
+                    _publish_schedule("executing", trade)
                     try:
-                        result = _execute_order(
+                        result = await asyncio.to_thread(
+                            _execute_order,
                             trade["side"],
                             trade["quantity"],
                             trade["order_type"],
@@ -153,15 +289,93 @@ async def _scheduled_trade_runner():
                         trade["status"] = "executed"
                         trade["result"] = result
                         trade["executed_at"] = datetime.now().isoformat()
+                        _notify_trade_action()
+                        _publish_schedule("executed", trade)
                     except Exception as e:
                         trade["status"] = "failed"
                         trade["error"] = str(e)
+                        _publish_schedule("failed", trade)
         await asyncio.sleep(1)
 
 
+# ---------- Background task: candle feeder ----------
+def _mid_price(book: dict) -> float | None:
+    bids = book.get("bids", {})
+    asks = book.get("asks", {})
+    if not bids or not asks:
+        return None
+    return (max(map(float, bids.keys())) + min(map(float, asks.keys()))) / 2
+
+
+def _push_candles(updated: dict):
+    for client, query in list(_candle_clients.items()):
+        candle = updated.get(query["timeframe"])
+        if candle is not None:
+            client.push(
+                {
+                    "success": True,
+                    "type": "update",
+                    "timeframe": query["timeframe"],
+                    "data": candle,
+                }
+            )
+
+
+async def _orderbook_sampler():
+    """Polls the CoinDCX orderbook for /ws/orderbook clients and the candles.
+
+    Samples every ORDERBOOK_POLL_ACTIVE while anyone watches the orderbook or
+    candles (so 1s candles get several samples), ORDERBOOK_POLL_IDLE otherwise.
+    The rate is kept from sample start to sample start, so a slow request
+    doesn't stretch the interval. Failures are logged once per distinct error.
+    """
+    global _latest_orderbook
+    next_at = time.monotonic()
+    last_error = None
+    while True:
+        frame = None
+        try:
+            response = await asyncio.to_thread(
+                requests.get, ORDERBOOK_URL_COINDCX, timeout=ORDERBOOK_TIMEOUT
+            )
+            book = response.json()
+            frame = {"success": True, "data": book}
+            mid = _mid_price(book)
+            if mid is None:
+                raise ValueError("orderbook has no bids or asks")
+            _push_candles(candles.ingest(CANDLE_PAIR, mid))
+            if last_error is not None:
+                print("Orderbook sampler recovered")
+                last_error = None
+        except Exception as e:
+            if frame is None:
+                frame = {"success": False, "error": str(e)}
+            if str(e) != last_error:
+                print("Orderbook sample failed:", e, datetime.now())
+                last_error = str(e)
+        if frame != _latest_orderbook:
+            _latest_orderbook = frame
+            for client in list(_orderbook_clients):
+                client.push(frame)
+
+        active = _orderbook_clients or _candle_clients
+        next_at += ORDERBOOK_POLL_ACTIVE if active else ORDERBOOK_POLL_IDLE
+        delay = next_at - time.monotonic()
+        if delay < 0:
+            # fell behind (slow request): resume the schedule from now
+            next_at = time.monotonic()
+            delay = 0
+        await asyncio.sleep(delay)
+
+
 @app.on_event("startup")
 async def startup():
+    global _loop
+    _loop = asyncio.get_running_loop()
     asyncio.create_task(_scheduled_trade_runner())
+    # loads venue specs (lot sizes) up front; failures are retried on each refresh
+    asyncio.create_task(router.refresh(force=True))
+    asyncio.create_task(_orderbook_sampler())
 
 
 # ---------- API Endpoints ----------
@@ -174,6 +388,7 @@ def api_place_order(req: OrderRequest):
         data = _execute_order(
             req.side, req.quantity, req.order_type, req.price, req.leverage
         )
+        _notify_trade_action()
         return {"success": True, "data": data}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -201,6 +416,7 @@ def api_cancel_order(req: CancelOrderRequest):
 
         response = requests.post(CANCEL_ORDER_COINDCX, data=json_body, headers=headers)
         data = response.json()
+        _notify_trade_action()
         return {"success": True, "data": data}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -221,6 +437,7 @@ def api_exit_position(position_id: str):
     """Exit a single position by ID."""
     try:
         data = exit_position(position_id)
+        _notify_trade_action()
         return {"success": True, "data": data}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -231,6 +448,7 @@ def api_exit_all():
     """Exit all active positions."""
     try:
         exit_all_positions()
+        _notify_trade_action()
         return {"success": True, "message": "All positions exited"}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -247,6 +465,82 @@ def api_get_orderbook():
         return {"success": False, "error": str(e)}
 
 
+# ---------- Smart order routing ----------
+
+
+@app.get("/api/route/book")
+async def api_route_book():
+    """Merged top-of-book across CoinDCX and Delta Exchange."""
+    try:
+        await router.refresh()
+        return {"success": True, "data": router.top_of_book()}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@app.post("/api/route/order")
+async def api_route_order(req: RoutedOrderRequest):
+    """Route or split a market order to the venues with the best effective price."""
+    try:
+        await router.refresh(force=True)
+        plan = router.plan(req.side, req.quantity)
+        if req.dry_run:
+            return {"success": True, "data": {"plan": plan, "results": []}}
+        if plan["unfilled"] > 0:
+            # A market order must not silently fill only part of the request
+            return {
+                "success": False,
+                "error": f"Not enough visible liquidity: {plan['unfilled']} of "
+                f"{plan['quantity']} cannot be routed",
+            }
+        results = await router.execute(plan, req.leverage)
+        filled = [r["venue"] for r in results if r["success"]]
+        failed = [r["venue"] for r in results if not r["success"]]
+        if filled:
+            _notify_trade_action()
+        response = {
+            "success": not failed,
+            "partial": bool(filled and failed),
+            "filled": filled,
+            "data": {"plan": plan, "results": results},
+        }
+        if failed and filled:
+            response["error"] = (
+                f"Order partially executed: filled on {', '.join(filled)}, "
+                f"failed on {', '.join(failed)}"
+            )
+        elif failed:
+            response["error"] = f"Order failed on {', '.join(failed)}"
+        return response
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+@app.get("/api/route/stats")
+def api_route_stats():
+    """Routing decision time and per-venue book latency."""
+    return {"success": True, "data": router.stats()}
+
+
+# ---------- Candles ----------
+
+
+@app.get("/api/candles")
+async def api_get_candles(
+    pair: str = CANDLE_PAIR, timeframe: str = "1m", limit: int = 500
+):
+    """Candles (oldest first) as one array per field: t, o, h, l, c, v.
+
+    Async so reads run on the loop thread, like the sampler's writes; v is 0
+    for candles built from the mid-price.
+    """
+    try:
+        data = candles.candles(pair, timeframe, limit)
+        return {"success": True, "timeframe": timeframe, "data": data}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 # ---------- Scheduled trades ----------
 
 
@@ -270,6 +564,7 @@ def api_schedule_trade(req: ScheduledTradeRequest):
             "created_at": datetime.now().isoformat(),
         }
         scheduled_trades.append(trade)
+        _publish_schedule("created", trade)
         return {"success": True, "data": trade}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -277,8 +572,8 @@ def api_schedule_trade(req: ScheduledTradeRequest):
 
 @app.get("/api/schedule")
 def api_get_scheduled():
-    """Get all scheduled trades."""
-    return {"success": True, "data": scheduled_trades}
+    """Get active and recently finished scheduled trades (same as /ws/schedule)."""
+    return {"success": True, "data": _schedule_snapshot()["data"]}
 
 
 @app.delete("/api/schedule/{trade_id}")
@@ -288,6 +583,7 @@ def api_cancel_scheduled(trade_id: str):
         if trade["id"] == trade_id:
             if trade["status"] == "pending":
                 trade["status"] = "cancelled"
+                _publish_schedule("cancelled", trade)
                 return {"success": True, "data": trade}
             else:
                 return {
@@ -336,70 +632,257 @@ def api_get_orders(page: str = "1", size: str = "50"):
         return {"success": False, "error": str(e)}
 
 
+# ---------- WebSocket client ----------
+
+
+class _StreamClient:
+    """Outbound side of one WebSocket: bounded queue, sender and reader tasks.
+
+    Producers call `push()` which never blocks. Snapshot streams keep a
+    single latest-wins slot, so a slow client only ever gets the newest
+    frame. Event streams pass `snapshot`: they buffer up to WS_QUEUE_SIZE
+    events, and on overflow a fresh snapshot replaces the dropped events.
+    Clients that keep dropping frames or whose sends stall are dropped.
+    """
+
+    def __init__(
+        self, websocket: WebSocket, topic: str, on_message=None, snapshot=None
+    ):
+        self.websocket = websocket
+        self.topic = topic
+        self.on_message = on_message
+        self.snapshot = snapshot
+        self.queue: asyncio.Queue = asyncio.Queue(
+            maxsize=1 if snapshot is None else WS_QUEUE_SIZE
+        )
+        self.wakeup = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.close_reason: str | None = None
+        self.sent = 0
+        self.conflated = 0
+        self.lag = 0
+        self.max_depth = 0
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        _ws_clients.add(self)
+        self._tasks = [
+            asyncio.create_task(self._send_loop()),
+            asyncio.create_task(self._read_loop()),
+        ]
+
+    def push(self, payload: dict):
+        if self.closed.is_set():
+            return
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.conflated += 1
+                self.lag += 1
+            if self.lag > WS_MAX_LAG:
+                self.close("slow")
+                return
+            if self.snapshot is not None:
+                payload = self.snapshot()
+        self.queue.put_nowait(payload)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def close(self, reason: str = "disconnected"):
+        if self.closed.is_set():
+            return
+        self.close_reason = reason
+        self.closed.set()
+        self.wakeup.set()
+        _ws_clients.discard(self)
+        _stream_wakeups.discard(self.wakeup)
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+
+    async def aclose(self):
+        """Close the client and, if it was dropped server-side, the socket."""
+        self.close()
+        if self.close_reason != "disconnected":
+            try:
+                await asyncio.wait_for(self.websocket.close(code=1013), timeout=1)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "topic": self.topic,
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "conflated": self.conflated,
+            "lag": self.lag,
+        }
+
+    async def _send_loop(self):
+        try:
+            while True:
+                payload = await self.queue.get()
+                await asyncio.wait_for(
+                    self.websocket.send_json(payload), timeout=WS_SEND_TIMEOUT
+                )
+                self.sent += 1
+                self.lag = 0
+        except asyncio.TimeoutError:
+            self.close("stuck")
+        except Exception:
+            self.close()
+
+    async def _read_loop(self):
+        """Read control messages; also notices client disconnects promptly."""
+        try:
+            while True:
+                text = await self.websocket.receive_text()
+                if self.on_message is None:
+                    continue
+                try:
+                    msg = json.loads(text)
+                except ValueError:
+                    continue
+                if isinstance(msg, dict):
+                    self.on_message(msg)
+        except Exception:
+            self.close()
+
+
+@app.get("/api/ws/clients")
+def api_ws_clients():
+    """Per-client outbound queue stats for all open WebSocket streams."""
+    return {"success": True, "data": [c.stats() for c in list(_ws_clients)]}
+
+
 # ---------- WebSockets ----------
 
 
 @app.websocket("/ws/positions")
 async def ws_positions(websocket: WebSocket):
-    """WebSocket that pushes positions every 1 second."""
+    """WebSocket that pushes positions on an adaptive interval, only when changed."""
     await websocket.accept()
+    client = _StreamClient(websocket, "positions")
+    client.start()
+    _stream_wakeups.add(client.wakeup)
+    interval = REFRESH_BASE
+    last_hash = None
     try:
-        while True:
+        while not client.closed.is_set():
             try:
-                data = get_positions()
-                await websocket.send_json({"success": True, "data": data})
+                data = await asyncio.to_thread(get_positions)
+                payload = {"success": True, "data": data}
             except Exception as e:
-                await websocket.send_json({"success": False, "error": str(e)})
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
-        pass
+                payload = {"success": False, "error": str(e)}
+            digest = _content_hash(payload)
+            changed = digest != last_hash
+            if changed:
+                client.push(payload)
+                last_hash = digest
+            interval = _next_interval(interval, changed)
+            await _wait_refresh(client.wakeup, interval)
+    finally:
+        await client.aclose()
 
 
 @app.websocket("/ws/orders")
 async def ws_orders(websocket: WebSocket):
-    """WebSocket that pushes orders every 1 second. Client sends page/size."""
+    """WebSocket that pushes orders on an adaptive interval. Client sends page/size."""
     await websocket.accept()
-    page = "1"
-    size = "50"
+    query = {"page": "1", "size": "50"}
+
+    def on_message(msg: dict):
+        # Page changes refresh immediately instead of waiting out the interval
+        if "page" in msg:
+            query["page"] = str(msg["page"])
+        if "size" in msg:
+            query["size"] = str(msg["size"])
+        client.wakeup.set()
+
+    client = _StreamClient(websocket, "orders", on_message)
+    client.start()
+    _stream_wakeups.add(client.wakeup)
+    interval = REFRESH_BASE
+    last_hash = None
     try:
-        while True:
-            # Check for client messages (page changes) without blocking
+        while not client.closed.is_set():
+            page, size = query["page"], query["size"]
             try:
-                msg = await asyncio.wait_for(websocket.receive_json(), timeout=0.05)
-                if "page" in msg:
-                    page = str(msg["page"])
-                if "size" in msg:
-                    size = str(msg["size"])
-            except Exception:
-                pass
-
-            try:
-                data = _fetch_orders(page, size)
-                await websocket.send_json(
-                    {"success": True, "data": data, "page": int(page)}
-                )
+                data = await asyncio.to_thread(_fetch_orders, page, size)
+                payload = {"success": True, "data": data, "page": int(page)}
             except Exception as e:
-                await websocket.send_json({"success": False, "error": str(e)})
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
-        pass
+                payload = {"success": False, "error": str(e)}
+            digest = _content_hash(payload)
+            changed = digest != last_hash
+            if changed:
+                client.push(payload)
+                last_hash = digest
+            interval = _next_interval(interval, changed)
+            await _wait_refresh(client.wakeup, interval)
+    finally:
+        await client.aclose()
 
 
 @app.websocket("/ws/orderbook")
 async def ws_orderbook(websocket: WebSocket):
-    """WebSocket that pushes orderbook data every 1 second."""
+    """WebSocket that pushes each changed orderbook from the shared sampler."""
     await websocket.accept()
+    client = _StreamClient(websocket, "orderbook")
+    client.start()
+    if _latest_orderbook is not None:
+        client.push(_latest_orderbook)
+    _orderbook_clients.add(client)
     try:
-        while True:
-            try:
-                response = requests.get(ORDERBOOK_URL_COINDCX)
-                data = response.json()
-                await websocket.send_json({"success": True, "data": data})
-            except Exception as e:
-                await websocket.send_json({"success": False, "error": str(e)})
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
-        pass
+        await client.closed.wait()
+    finally:
+        _orderbook_clients.discard(client)
+        await client.aclose()
+
+
+@app.websocket("/ws/schedule")
+async def ws_schedule(websocket: WebSocket):
+    """WebSocket that sends active scheduled trades, then pushes each state change."""
+    await websocket.accept()
+    client = _StreamClient(websocket, "schedule", snapshot=_schedule_snapshot)
+    client.start()
+    client.push(_schedule_snapshot())
+    _schedule_clients.add(client)
+    try:
+        await client.closed.wait()
+    finally:
+        _schedule_clients.discard(client)
+        await client.aclose()
+
+
+@app.websocket("/ws/candles")
+async def ws_candles(websocket: WebSocket, timeframe: str = "1m"):
+    """WebSocket that sends a candle snapshot, then each update. Client sends timeframe."""
+    await websocket.accept()
+    query = {"timeframe": timeframe if timeframe in TIMEFRAMES else "1m"}
+
+    def snapshot() -> dict:
+        return {
+            "success": True,
+            "type": "snapshot",
+            "timeframe": query["timeframe"],
+            "data": candles.candles(CANDLE_PAIR, query["timeframe"]),
+        }
+
+    def on_message(msg: dict):
+        if msg.get("timeframe") in TIMEFRAMES:
+            query["timeframe"] = msg["timeframe"]
+            client.push(snapshot())
+
+    client = _StreamClient(websocket, "candles", on_message, snapshot=snapshot)
+    client.start()
+    client.push(snapshot())
+    _candle_clients[client] = query
+    try:
+        await client.closed.wait()
+    finally:
+        _candle_clients.pop(client, None)
+        await client.aclose()
 
 
 if __name__ == "__main__":
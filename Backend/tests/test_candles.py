@@ -0,0 +1,70 @@
+import pytest
+
+from candles import FIELDS, CandleAggregator, CandleRing
+
+
+def _ring(prices, seconds=1, capacity=3):
+    """One tick per price, one bucket apart, starting at t=100."""
+    ring = CandleRing(seconds, capacity)
+    for i, price in enumerate(prices):
+        ring.update(100 + i * seconds, price)
+    return ring
+
+
+def test_ticks_in_one_bucket_build_ohlc():
+    ring = CandleRing(60, 3)
+    for ts, price in [(120, 5.0), (130, 7.0), (140, 4.0), (179, 6.0)]:
+        ring.update(ts, price, volume=1.0)
+
+    assert ring.latest() == [120.0, 5.0, 7.0, 4.0, 6.0, 4.0]
+
+
+def test_columns_unwrap_oldest_first_after_wraparound():
+    ring = _ring([1.0, 2.0, 3.0, 4.0, 5.0])
+    cols = ring.columns()
+
+    assert ring.count == 3
+    assert cols["t"] == [102.0, 103.0, 104.0]
+    assert cols["c"] == [3.0, 4.0, 5.0]
+    assert set(cols) == set(FIELDS)
+    # every field is aligned with t across the wrap point
+    assert cols["o"] == cols["h"] == cols["l"] == cols["c"]
+
+
+@pytest.mark.parametrize(
+    "limit, expected", [(0, []), (2, [103.0, 104.0]), (10, [102.0, 103.0, 104.0])]
+)
+def test_columns_limit(limit, expected):
+    ring = _ring([1.0, 2.0, 3.0, 4.0, 5.0])
+
+    assert ring.columns(limit)["t"] == expected
+
+
+def test_out_of_order_tick_is_ignored():
+    ring = _ring([1.0, 2.0])
+
+    assert ring.update(100, 99.0) is False
+    assert ring.columns()["h"] == [1.0, 2.0]
+
+
+def test_empty_ring():
+    ring = CandleRing(1, 3)
+
+    assert ring.latest() is None
+    assert ring.columns() == {name: [] for name in FIELDS}
+
+
+def test_aggregator_updates_every_timeframe():
+    agg = CandleAggregator(capacity=10)
+    updated = agg.ingest("X", 1.5, ts=3600)
+
+    assert set(updated) == {"1s", "1m", "5m", "1h"}
+    assert agg.candles("X", "1h")["t"] == [3600.0]
+    assert agg.candles("unknown", "1m") == {name: [] for name in FIELDS}
+
+
+def test_aggregator_rejects_unknown_timeframe():
+    agg = CandleAggregator()
+
+    with pytest.raises(ValueError):
+        agg.candles("X", "2m")
@@ -0,0 +1,55 @@
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "scheduled_trades", [])
+    monkeypatch.setattr(main, "_finished_trades", deque(maxlen=2))
+    with TestClient(main.app) as client:
+        yield client
+
+
+def _schedule(client, quantity):
+    execute_at = (datetime.now() + timedelta(hours=1)).isoformat()
+    res = client.post(
+        "/api/schedule",
+        json={"side": "buy", "quantity": quantity, "execute_at": execute_at},
+    ).json()
+    assert res["success"]
+    return res["data"]
+
+
+def test_snapshot_then_created_and_cancelled_events(client):
+    existing = _schedule(client, 1)
+    with client.websocket_connect("/ws/schedule") as ws:
+        snapshot = ws.receive_json()
+        assert snapshot["type"] == "snapshot"
+        assert [t["id"] for t in snapshot["data"]] == [existing["id"]]
+
+        trade = _schedule(client, 2)
+        created = ws.receive_json()
+        assert created["type"] == "created"
+        assert created["data"]["id"] == trade["id"]
+
+        client.delete(f"/api/schedule/{trade['id']}")
+        cancelled = ws.receive_json()
+        assert cancelled["type"] == "cancelled"
+        assert cancelled["data"]["status"] == "cancelled"
+
+
+def test_schedule_listing_is_bounded(client):
+    for quantity in range(4):
+        trade = _schedule(client, quantity + 1)
+        client.delete(f"/api/schedule/{trade['id']}")
+    active = _schedule(client, 9)
+
+    data = client.get("/api/schedule").json()["data"]
+    # only the last two finished trades (maxlen) plus the active one
+    assert [t["quantity"] for t in data] == [3, 4, 9]
+    assert data[-1]["id"] == active["id"]
@@ -0,0 +1,103 @@
+import asyncio
+
+import main
+from main import _StreamClient
+
+
+class FakeWebSocket:
+    """Records sent frames; each send takes `delay` seconds."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed_with = None
+
+    async def send_json(self, payload):
+        await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+    async def receive_text(self):
+        await asyncio.sleep(3600)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_snapshot_stream_keeps_only_the_latest_frame():
+    async def run():
+        ws = FakeWebSocket(delay=0.2)
+        client = _StreamClient(ws, "test")
+        client.start()
+        for i in range(10):
+            client.push(i)
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.5)
+        client.close()
+        return ws.sent, client
+
+    sent, client = asyncio.run(run())
+    # every frame after the first in-flight one is the newest at send time
+    assert sent[0] == 0 and sent[-1] == 9
+    assert sent == sorted(sent) and len(sent) < 10
+    assert client.max_depth == 1
+    assert client.conflated == 10 - len(sent)
+
+
+def test_event_stream_resyncs_with_snapshot_on_overflow():
+    async def run():
+        ws = FakeWebSocket(delay=0.1)
+        client = _StreamClient(ws, "events", snapshot=lambda: "snapshot")
+        client.start()
+        for i in range(main.WS_QUEUE_SIZE + 2):
+            client.push(f"event-{i}")
+        await asyncio.sleep(0.5)
+        client.close()
+        return ws.sent, client
+
+    sent, client = asyncio.run(run())
+    # the full queue of events is replaced by one snapshot, later events follow
+    assert sent == ["snapshot", f"event-{main.WS_QUEUE_SIZE + 1}"]
+    assert client.conflated == main.WS_QUEUE_SIZE
+
+
+def test_client_that_keeps_dropping_frames_is_closed_as_slow():
+    async def run():
+        ws = FakeWebSocket(delay=3600)
+        client = _StreamClient(ws, "test")
+        client.start()
+        await asyncio.sleep(0)
+        for i in range(main.WS_MAX_LAG + 5):
+            client.push(i)
+        await client.aclose()
+        return client, ws
+
+    client, ws = asyncio.run(run())
+    assert client.close_reason == "slow"
+    assert ws.closed_with == 1013
+
+
+def test_stalled_send_closes_client_as_stuck(monkeypatch):
+    monkeypatch.setattr(main, "WS_SEND_TIMEOUT", 0.05)
+
+    async def run():
+        ws = FakeWebSocket(delay=3600)
+        client = _StreamClient(ws, "test")
+        client.start()
+        client.push("frame")
+        await asyncio.wait_for(client.closed.wait(), timeout=1)
+        return client
+
+    client = asyncio.run(run())
+    assert client.close_reason == "stuck"
+    assert client not in main._ws_clients
+
+
+def test_only_refresh_streams_are_woken_by_trade_actions():
+    async def run():
+        client = _StreamClient(FakeWebSocket(), "orderbook")
+        client.start()
+        registered = client.wakeup in main._stream_wakeups
+        client.close()
+        return registered
+
+    assert asyncio.run(run()) is False
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import threading
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from venues import CoinDCXVenue, DeltaVenue, SmartRouter, Venue
+
+
+class StubVenue(Venue):
+    """In-process stand-in: fixed book, records orders instead of sending them."""
+
+    def __init__(self, name, bids=(), asks=(), fee=0.0, lot_size="0.01", fail=None):
+        super().__init__("http://stub")
+        self.name = name
+        self.taker_fee = fee
+        self.lot_size = Decimal(lot_size)
+        self.book = {"bids": list(bids), "asks": list(asks)}
+        self.fail = fail
+        self.orders = []
+
+    def fetch_book(self):
+        if self.fail == "book":
+            raise ConnectionError(f"{self.name} book down")
+        return self.book
+
+    def place_order(self, side, quantity, leverage):
+        if self.fail == "order":
+            raise ConnectionError(f"{self.name} rejected")
+        self.orders.append((side, quantity, leverage))
+        return {"id": f"{self.name}-1", "quantity": quantity}
+
+
+def _router(*venues):
+    router = SmartRouter(list(venues))
+    asyncio.run(router.refresh(force=True))
+    return router
+
+
+def _alloc(plan):
+    return {a["venue"]: a["quantity"] for a in plan["allocations"]}
+
+
+def test_buy_splits_across_venues_best_price_first():
+    a = StubVenue("a", asks=[(100.0, 1.0), (102.0, 5.0)])
+    b = StubVenue("b", asks=[(101.0, 2.0), (103.0, 5.0)])
+    plan = _router(a, b).plan("buy", 4)
+
+    assert _alloc(plan) == {"a": 2.0, "b": 2.0}
+    assert plan["unfilled"] == 0
+    assert plan["effective_price"] == pytest.approx((100 + 2 * 101 + 102) / 4)
+
+
+def test_sell_walks_bids_high_to_low():
+    a = StubVenue("a", bids=[(99.0, 1.0)])
+    b = StubVenue("b", bids=[(100.0, 1.0), (98.0, 5.0)])
+    plan = _router(a, b).plan("sell", 2.5)
+
+    assert _alloc(plan) == {"b": 1.5, "a": 1.0}
+
+
+def test_fees_decide_between_venues():
+    # b quotes the better raw price but its fee makes it the worse fill
+    a = StubVenue("a", asks=[(100.0, 5.0)], fee=0.0)
+    b = StubVenue("b", asks=[(99.95, 5.0)], fee=0.001)
+    plan = _router(a, b).plan("buy", 1)
+
+    assert _alloc(plan) == {"a": 1.0}
+
+
+def test_unfilled_remainder_is_reported():
+    a = StubVenue("a", bids=[(100.0, 2.0)])
+    b = StubVenue("b", bids=[(99.0, 1.0)])
+    plan = _router(a, b).plan("sell", 10)
+
+    assert plan["routable"] == 3.0
+    assert plan["unfilled"] == 7.0
+
+
+@pytest.mark.parametrize("quantity", [0, -1])
+def test_non_positive_quantity_rejected(quantity):
+    router = _router(StubVenue("a", asks=[(100.0, 1.0)]))
+    with pytest.raises(ValueError):
+        router.plan("buy", quantity)
+
+
+def test_lot_sized_venue_only_gets_whole_lots():
+    a = StubVenue("a", asks=[(101.0, 10.0)])
+    d = StubVenue("d", asks=[(100.0, 10.0)], lot_size="1")
+    plan = _router(a, d).plan("buy", 2.5)
+
+    assert _alloc(plan) == {"d": 2.0, "a": 0.5}
+
+
+def test_allocations_are_exact_lot_multiples():
+    coindcx = StubVenue("coindcx", asks=[(101.0, 10.0)], lot_size="0.001")
+    delta = StubVenue("delta", asks=[(100.0, 0.7)], lot_size="0.1")
+    plan = _router(coindcx, delta).plan("buy", 1.0)
+
+    assert _alloc(plan) == {"delta": 0.7, "coindcx": 0.3}
+    for alloc in plan["allocations"]:
+        venue = coindcx if alloc["venue"] == "coindcx" else delta
+        assert Decimal(str(alloc["quantity"])) % venue.lot_size == 0
+        assert venue.lots(alloc["quantity"]) == alloc["lots"]
+    assert plan["unfilled"] == 0
+
+
+def test_quantity_below_every_lot_is_unfilled():
+    d = StubVenue("d", asks=[(100.0, 10.0)], lot_size="1")
+    plan = _router(d).plan("buy", 0.5)
+
+    assert plan["allocations"] == []
+    assert plan["unfilled"] == 0.5
+
+
+def test_venue_without_spec_is_not_routed():
+    class NoSpec(StubVenue):
+        def load_spec(self):
+            raise ConnectionError("spec endpoint down")
+
+    a = StubVenue("a", asks=[(101.0, 5.0)])
+    b = NoSpec("b", asks=[(100.0, 5.0)])
+    b.lot_size = None
+    router = _router(a, b)
+
+    assert _alloc(router.plan("buy", 1)) == {"a": 1.0}
+    assert "spec endpoint down" in router.top_of_book()["errors"]["b"]
+
+
+def test_venue_is_abstract():
+    with pytest.raises(TypeError):
+        Venue("http://stub")
+
+
+def test_book_error_excludes_venue_and_is_recorded():
+    a = StubVenue("a", asks=[(100.0, 5.0)])
+    b = StubVenue("b", fail="book")
+    router = _router(a, b)
+    plan = router.plan("buy", 1)
+
+    assert _alloc(plan) == {"a": 1.0}
+    assert "b" in router.top_of_book()["errors"]
+    assert router.stats()["venues"]["b"]["samples"] == 1
+
+
+def test_execute_reports_per_venue_results():
+    a = StubVenue("a", asks=[(100.0, 1.0)])
+    b = StubVenue("b", asks=[(101.0, 5.0)], fail="order")
+    router = _router(a, b)
+    plan = router.plan("buy", 3)
+    results = {r["venue"]: r for r in asyncio.run(router.execute(plan, 10))}
+
+    assert results["a"]["success"] is True
+    assert results["a"]["data"]["quantity"] == 1.0
+    assert results["b"]["success"] is False
+    assert "rejected" in results["b"]["error"]
+    assert a.orders == [("buy", 1.0, 10)]
+    assert all(r["latency_ms"] >= 0 for r in results.values())
+
+
+def test_live_and_testnet_venues_cannot_be_mixed():
+    live = StubVenue("live")
+    test = StubVenue("test")
+    test.testnet = True
+    with pytest.raises(ValueError):
+        SmartRouter([live, test])
+
+
+# ---------- Exchange adapters against a local HTTP stand-in ----------
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    orders = []
+
+    def do_GET(self):
+        if self.path.startswith("/v2/products/"):
+            self._reply({"result": {"contract_value": "0.1"}})
+        elif self.path.startswith("/instrument"):
+            self._reply({"instrument": {"quantity_increment": "0.001"}})
+        else:
+            self._reply(
+                {
+                    "result": {
+                        "buy": [{"price": "99.5", "size": 3}],
+                        "sell": [{"price": "100.5", "size": 2}],
+                    }
+                }
+            )
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        self.orders.append(json.loads(self.rfile.read(length)))
+        self._reply({"success": True})
+
+    def _reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    monkeypatch.setattr("venues.DELTA_API_KEY", "key")
+    monkeypatch.setattr("venues.DELTA_API_SECRET", "secret")
+    _StandInHandler.orders = []
+    server = HTTPServer(("127.0.0.1", 0), _StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_delta_book_and_order_use_whole_contracts(stand_in):
+    delta = DeltaVenue(stand_in, symbol="TESTUSD")
+    delta.load_spec()
+    assert delta.contract_value == Decimal("0.1")
+    book = delta.fetch_book()
+    assert book["bids"] == [(99.5, 0.3)]
+    assert book["asks"] == [(100.5, 0.2)]
+
+    delta.place_order("buy", 0.2, 10)
+    assert _StandInHandler.orders[-1]["size"] == 2
+    assert _StandInHandler.orders[-1]["product_symbol"] == "TESTUSD"
+
+    with pytest.raises(ValueError):
+        delta.place_order("buy", 0.05, 10)
+
+
+def test_coindcx_loads_quantity_step_and_rejects_off_step_orders(stand_in):
+    coindcx = CoinDCXVenue(
+        order_url=stand_in, instrument_url=f"{stand_in}/instrument"
+    )
+    coindcx.load_spec()
+    assert coindcx.lot_size == Decimal("0.001")
+
+    with pytest.raises(ValueError):
+        coindcx.place_order("buy", 0.0005, 10)
+
+
+# ---------- /api/route/order ----------
+
+
+def _route(monkeypatch, *venues, quantity):
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setattr(main, "router", SmartRouter(list(venues)))
+    with TestClient(main.app) as client:
+        return client.post(
+            "/api/route/order", json={"side": "buy", "quantity": quantity}
+        ).json()
+
+
+def test_route_order_reports_partial_execution(monkeypatch):
+    a = StubVenue("a", asks=[(100.0, 1.0)])
+    b = StubVenue("b", asks=[(101.0, 5.0)], fail="order")
+    res = _route(monkeypatch, a, b, quantity=3)
+
+    assert res["success"] is False
+    assert res["partial"] is True
+    assert res["filled"] == ["a"]
+    assert "failed on b" in res["error"]
+
+
+def test_route_order_success_when_every_leg_fills(monkeypatch):
+    a = StubVenue("a", asks=[(100.0, 1.0)])
+    b = StubVenue("b", asks=[(101.0, 5.0)])
+    res = _route(monkeypatch, a, b, quantity=3)
+
+    assert res["success"] is True
+    assert res["partial"] is False
+    assert sorted(res["filled"]) == ["a", "b"]
+
+
+def test_route_order_rejects_unfillable_quantity(monkeypatch):
+    a = StubVenue("a", asks=[(100.0, 1.0)])
+    res = _route(monkeypatch, a, quantity=3)
+
+    assert res["success"] is False
+    assert a.orders == []
@@ -22,7 +22,9 @@ COINDCX_API_KEY = os.getenv("COINDCX_API_KEY")
 DELTA_API_SECRET = os.getenv("DELTA_API_SECRET")
 COINDCX_API_SECRET = os.getenv("COINDCX_API_SECRET")
 
-BASE_URL_DELTA = "https://cdn-ind.testnet.deltaex.org"
+# No defaults: live vs testnet and the product must be chosen explicitly
+BASE_URL_DELTA = os.getenv("DELTA_BASE_URL")
+DELTA_SYMBOL = os.getenv("DELTA_SYMBOL")
 BASE_URL_COINDCX = (
     "https://api.coindcx.com/exchange/v1/derivatives/futures/orders/create"
 )
@@ -32,6 +34,25 @@ ORDERBOOK_URL_COINDCX = (
 CANCEL_ORDER_COINDCX = (
     "https://api.coindcx.com/exchange/v1/derivatives/futures/orders/cancel"
 )
+INSTRUMENT_URL_COINDCX = (
+    "https://api.coindcx.com/exchange/v1/derivatives/futures/data/instrument"
+)
+
+
+def coindcx_signed_post(url: str, body: dict, timeout: float | None = None):
+    """POST `body` to a private CoinDCX endpoint with HMAC-SHA256 auth headers."""
+    secret_bytes = bytes(COINDCX_API_SECRET, encoding="utf-8")
+
+    json_body = json.dumps(body, separators=(",", ":"))
+    signature = hmac.new(secret_bytes, json_body.encode(), hashlib.sha256).hexdigest()
+
+    headers = {
+        "Content-Type": "application/json",
+        "X-AUTH-APIKEY": COINDCX_API_KEY,
+        "X-AUTH-SIGNATURE": signature,
+    }
+
+    return requests.post(url, data=json_body, headers=headers, timeout=timeout)
 
 
 def get_closept(side: str):
@@ -0,0 +1,344 @@
+import time
+import hmac
+import hashlib
+import json
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from decimal import Decimal
+import requests
+from utils import (
+    coindcx_signed_post,
+    DELTA_API_KEY,
+    DELTA_API_SECRET,
+    BASE_URL_COINDCX,
+    ORDERBOOK_URL_COINDCX,
+    INSTRUMENT_URL_COINDCX,
+)
+
+# Books are normalised to {"bids": [(price, qty), ...], "asks": [...]} with
+# bids sorted high -> low, asks low -> high and qty in base units, so the
+# router can compare venues directly. Quantities are only routed in whole
+# multiples of each venue's lot_size, computed with Decimal.
+
+BOOK_TTL = 0.5  # seconds a fetched book is reused before refetching
+STATS_WINDOW = 100  # latency / decision-time samples kept per series
+
+
+class Venue(ABC):
+    """One exchange the router can read books from and send orders to."""
+
+    name = "venue"
+    taker_fee = 0.0005  # fraction of notional
+
+    def __init__(self, base_url: str, timeout: float = 5.0):
+        # base_url is overridable so a venue can be pointed at a local stand-in
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.testnet = "testnet" in self.base_url
+        # Quantity step in base units; None until load_spec() has fetched it
+        self.lot_size: Decimal | None = None
+
+    def load_spec(self):
+        """Fetch instrument specs (lot_size) from the exchange."""
+
+    @abstractmethod
+    def fetch_book(self) -> dict: ...
+
+    @abstractmethod
+    def place_order(self, side: str, quantity: float, leverage: int) -> dict: ...
+
+    def lots(self, quantity: float) -> int:
+        """Number of whole lots in `quantity`; raises if it isn't an exact multiple."""
+        if self.lot_size is None:
+            raise ValueError(f"{self.name} instrument spec not loaded")
+        lots = Decimal(str(quantity)) / self.lot_size
+        if lots <= 0 or lots != lots.to_integral_value():
+            raise ValueError(
+                f"{quantity} is not a whole number of {self.name} lots "
+                f"({self.lot_size})"
+            )
+        return int(lots)
+
+
+class CoinDCXVenue(Venue):
+    name = "coindcx"
+
+    def __init__(
+        self,
+        order_url: str = BASE_URL_COINDCX,
+        book_url: str = ORDERBOOK_URL_COINDCX,
+        instrument_url: str = INSTRUMENT_URL_COINDCX,
+        pair: str = "B-RIVER_USDT",
+        timeout: float = 5.0,
+    ):
+        super().__init__(order_url, timeout)
+        self.book_url = book_url
+        self.instrument_url = instrument_url
+        self.pair = pair
+
+    def load_spec(self):
+        params = {"pair": self.pair, "margin_currency_short_name": "USDT"}
+        data = requests.get(self.instrument_url, params=params, timeout=self.timeout)
+        self.lot_size = Decimal(str(data.json()["instrument"]["quantity_increment"]))
+
+    def fetch_book(self) -> dict:
+        data = requests.get(self.book_url, timeout=self.timeout).json()
+        bids = [(float(p), float(q)) for p, q in data.get("bids", {}).items()]
+        asks = [(float(p), float(q)) for p, q in data.get("asks", {}).items()]
+        return {"bids": sorted(bids, reverse=True), "asks": sorted(asks)}
+
+    def place_order(self, side: str, quantity: float, leverage: int) -> dict:
+        self.lots(quantity)  # refuse quantities off the pair's step size
+        body = {
+            "timestamp": int(round(time.time() * 1000)),
+            "order": {
+                "side": side,
+                "pair": self.pair,
+                "order_type": "market_order",
+                "total_quantity": quantity,
+                "leverage": leverage,
+            },
+        }
+        return coindcx_signed_post(self.base_url, body, timeout=self.timeout).json()
+
+
+class DeltaVenue(Venue):
+    """Delta Exchange; sizes are integer contracts of `contract_value` base units.
+
+    contract_value comes from the product endpoint, never from a default.
+    """
+
+    name = "delta"
+
+    def __init__(self, base_url: str, symbol: str, timeout: float = 5.0):
+        super().__init__(base_url, timeout)
+        self.symbol = symbol
+        self.contract_value: Decimal | None = None
+
+    def load_spec(self):
+        url = f"{self.base_url}/v2/products/{self.symbol}"
+        result = requests.get(url, timeout=self.timeout).json()["result"]
+        self.contract_value = Decimal(str(result["contract_value"]))
+        self.lot_size = self.contract_value
+
+    def _request(self, method: str, path: str, body: dict | None = None):
+        """Signed request (ported from the delta_request helper in app.py)."""
+        timestamp = str(int(time.time()))
+        body_str = json.dumps(body) if body else ""
+
+        message = method + timestamp + path + body_str
+        signature = hmac.new(
+            DELTA_API_SECRET.encode(), message.encode(), hashlib.sha256
+        ).hexdigest()
+
+        headers = {
+            "api-key": DELTA_API_KEY,
+            "Accept": "application/json",
+            "timestamp": timestamp,
+            "signature": signature,
+            "Content-Type": "application/json",
+        }
+
+        url = self.base_url + path
+        if method == "GET":
+            return requests.get(url, headers=headers, timeout=self.timeout)
+        return requests.post(url, headers=headers, data=body_str, timeout=self.timeout)
+
+    def _level(self, lvl: dict) -> tuple[float, float]:
+        """(price, qty in base units) from a level sized in contracts."""
+        qty = Decimal(str(lvl["size"])) * self.contract_value
+        return float(lvl["price"]), float(qty)
+
+    def fetch_book(self) -> dict:
+        url = f"{self.base_url}/v2/l2orderbook/{self.symbol}"
+        result = requests.get(url, timeout=self.timeout).json().get("result", {})
+        bids = [self._level(lvl) for lvl in result.get("buy", [])]
+        asks = [self._level(lvl) for lvl in result.get("sell", [])]
+        return {"bids": sorted(bids, reverse=True), "asks": sorted(asks)}
+
+    def place_order(self, side: str, quantity: float, leverage: int) -> dict:
+        # Delta sets leverage per product, not per order, so it is not sent here
+        contracts = self.lots(quantity)
+        body = {
+            "product_symbol": self.symbol,
+            "size": contracts,
+            "side": side,
+            "order_type": "market_order",
+        }
+        return self._request("POST", "/v2/orders", body).json()
+
+
+def _effective(price: float, side: str, fee: float) -> float:
+    """Fee-adjusted price: what a taker really pays (buy) or receives (sell)."""
+    return price * (1 + fee) if side == "buy" else price * (1 - fee)
+
+
+def _stats(samples: deque) -> dict:
+    if not samples:
+        return {"last_ms": None, "avg_ms": None, "max_ms": None, "samples": 0}
+    return {
+        "last_ms": round(samples[-1], 3),
+        "avg_ms": round(sum(samples) / len(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "samples": len(samples),
+    }
+
+
+class SmartRouter:
+    """Keeps a merged top-of-book across venues and routes/splits orders."""
+
+    def __init__(self, venues: list[Venue]):
+        # Never merge testnet and live books: a split could send real money
+        # one way and the rest of the order to a test exchange.
+        if len({v.testnet for v in venues}) > 1:
+            raise ValueError("cannot route across live and testnet venues")
+        self.venues = {v.name: v for v in venues}
+        self.books: dict[str, dict] = {}
+        self.errors: dict[str, str] = {}
+        self.fetched_at = 0.0
+        self.latency: dict[str, deque] = {
+            name: deque(maxlen=STATS_WINDOW) for name in self.venues
+        }
+        self.decision_time: deque = deque(maxlen=STATS_WINDOW)
+        self._lock = asyncio.Lock()
+
+    async def _fetch_one(self, venue: Venue):
+        start = time.perf_counter()
+        try:
+            if venue.lot_size is None:
+                # Specs load lazily and are retried until they succeed; a venue
+                # without them never gets a book, so it is never routed to
+                await asyncio.to_thread(venue.load_spec)
+            book = await asyncio.to_thread(venue.fetch_book)
+            self.books[venue.name] = book
+            self.errors.pop(venue.name, None)
+        except Exception as e:
+            self.books.pop(venue.name, None)
+            self.errors[venue.name] = str(e)
+        finally:
+            self.latency[venue.name].append((time.perf_counter() - start) * 1000)
+
+    async def refresh(self, force: bool = False):
+        """Fetch every venue's book concurrently, reusing books younger than BOOK_TTL."""
+        async with self._lock:
+            if not force and time.monotonic() - self.fetched_at < BOOK_TTL:
+                return
+            await asyncio.gather(*(self._fetch_one(v) for v in self.venues.values()))
+            self.fetched_at = time.monotonic()
+
+    def top_of_book(self) -> dict:
+        """Best bid/ask per venue and the merged best across venues."""
+        per_venue = {}
+        best_bid = best_ask = None
+        for name, book in self.books.items():
+            bid = book["bids"][0] if book["bids"] else None
+            ask = book["asks"][0] if book["asks"] else None
+            per_venue[name] = {"bid": bid, "ask": ask}
+            if bid and (best_bid is None or bid[0] > best_bid["price"]):
+                best_bid = {"venue": name, "price": bid[0], "qty": bid[1]}
+            if ask and (best_ask is None or ask[0] < best_ask["price"]):
+                best_ask = {"venue": name, "price": ask[0], "qty": ask[1]}
+        return {
+            "best_bid": best_bid,
+            "best_ask": best_ask,
+            "venues": per_venue,
+            "errors": dict(self.errors),
+        }
+
+    def plan(self, side: str, quantity: float) -> dict:
+        """Split `quantity` across venues by walking the merged, fee-adjusted book.
+
+        Levels from every venue are consumed best effective price first, which
+        is the cheapest split for a taker order of this size.
+        """
+        start = time.perf_counter()
+        side = side.lower()
+        if side not in ("buy", "sell"):
+            raise ValueError("side must be 'buy' or 'sell'")
+        if quantity <= 0:
+            raise ValueError("quantity must be positive")
+
+        book_side = "asks" if side == "buy" else "bids"
+        levels = []
+        for name, book in self.books.items():
+            venue = self.venues[name]
+            for price, qty in book[book_side]:
+                levels.append(
+                    (_effective(price, side, venue.taker_fee), price, qty, name)
+                )
+        levels.sort(key=lambda lvl: lvl[0], reverse=(side == "sell"))
+
+        fills: dict[str, dict] = {}
+        remaining = Decimal(str(quantity))
+        for eff, price, qty, name in levels:
+            if remaining <= 0:
+                break
+            lot = self.venues[name].lot_size
+            if lot is None:
+                continue
+            # Only whole lots can be sent; leave the rest for other levels
+            lots = int(min(Decimal(str(qty)), remaining) // lot)
+            if lots <= 0:
+                continue
+            take = lots * lot
+            fill = fills.setdefault(
+                name, {"lots": 0, "quantity": Decimal(0), "notional": 0.0, "cost": 0.0}
+            )
+            fill["lots"] += lots
+            fill["quantity"] += take
+            fill["notional"] += float(take) * price
+            fill["cost"] += float(take) * eff
+            remaining -= take
+
+        allocations = [
+            {
+                "venue": name,
+                "quantity": float(f["quantity"]),
+                "lots": f["lots"],
+                "avg_price": f["notional"] / float(f["quantity"]),
+                "effective_price": f["cost"] / float(f["quantity"]),
+            }
+            for name, f in fills.items()
+        ]
+        allocations.sort(key=lambda a: a["quantity"], reverse=True)
+        filled = float(Decimal(str(quantity)) - remaining)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.decision_time.append(elapsed)
+        return {
+            "side": side,
+            "quantity": quantity,
+            "routable": filled,
+            "unfilled": float(remaining),
+            "effective_price": (
+                sum(a["effective_price"] * a["quantity"] for a in allocations) / filled
+                if filled
+                else None
+            ),
+            "allocations": allocations,
+            "decision_ms": round(elapsed, 3),
+        }
+
+    async def execute(self, plan: dict, leverage: int) -> list[dict]:
+        """Send each allocation of a plan to its venue concurrently."""
+
+        async def send(alloc: dict):
+            venue = self.venues[alloc["venue"]]
+            start = time.perf_counter()
+            try:
+                data = await asyncio.to_thread(
+                    venue.place_order, plan["side"], alloc["quantity"], leverage
+                )
+                result = {"venue": venue.name, "success": True, "data": data}
+            except Exception as e:
+                result = {"venue": venue.name, "success": False, "error": str(e)}
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            return result
+
+        return await asyncio.gather(*(send(a) for a in plan["allocations"]))
+
+    def stats(self) -> dict:
+        return {
+            "decision": _stats(self.decision_time),
+            "venues": {name: _stats(s) for name, s in self.latency.items()},
+        }
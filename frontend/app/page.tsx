@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect, useCallback, useRef } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
@@ -26,11 +26,14 @@ import {
   exitPosition,
   exitAllPositions,
   scheduleTrade,
-  getScheduledTrades,
   cancelScheduledTrade,
   connectPositionsWS,
   connectOrderbookWS,
   connectOrdersWS,
+  connectScheduleWS,
+  connectCandlesWS,
+  getCandles,
+  type LiveSocket,
 } from "@/lib/api";
 
 // ─── Order Form ────────────────────────────────────────────
@@ -190,6 +193,12 @@ interface ScheduledTrade {
   [key: string]: unknown;
 }
 
+function upsertTrade(prev: ScheduledTrade[], trade: ScheduledTrade) {
+  return prev.some((t) => t.id === trade.id)
+    ? prev.map((t) => (t.id === trade.id ? trade : t))
+    : [...prev, trade];
+}
+
 function ScheduleTradeSection() {
   const [side, setSide] = useState<"buy" | "sell">("buy");
   const [orderType, setOrderType] = useState<"market_order" | "limit_order">(
@@ -204,20 +213,34 @@ function ScheduleTradeSection() {
   const [trades, setTrades] = useState<ScheduledTrade[]>([]);
   const [cancelLoading, setCancelLoading] = useState<string | null>(null);
 
-  const fetchTrades = useCallback(async () => {
-    try {
-      const res = await getScheduledTrades();
-      if (res.success) setTrades(res.data || []);
-    } catch {
-      /* ignore */
-    }
-  }, []);
-
   useEffect(() => {
-    fetchTrades();
-    const interval = setInterval(fetchTrades, 2000);
-    return () => clearInterval(interval);
-  }, [fetchTrades]);
+    // snapshot on every (re)connect, then one event per status change
+    const ws = connectScheduleWS((data: unknown) => {
+      const msg = data as {
+        success: boolean;
+        type: string;
+        data: ScheduledTrade[] | ScheduledTrade;
+      };
+      if (!msg.success || !msg.data) return;
+      if (msg.type === "snapshot") {
+        // active plus recently finished trades
+        const snapshot = msg.data as ScheduledTrade[];
+        setTrades((prev) => {
+          // keep older finished trades already shown, replace the rest
+          const ids = new Set(snapshot.map((t) => t.id));
+          const done = prev.filter(
+            (t) =>
+              !ids.has(t.id) && t.status !== "pending" && t.status !== "executing"
+          );
+          return [...done, ...snapshot];
+        });
+        return;
+      }
+      const trade = msg.data as ScheduledTrade;
+      setTrades((prev) => upsertTrade(prev, trade));
+    });
+    return () => ws.close();
+  }, []);
 
   const handleSchedule = async () => {
     setLoading(true);
@@ -242,11 +265,12 @@ function ScheduleTradeSection() {
       }
       const res = await scheduleTrade(data);
       if (res.success) {
+        // don't depend on the socket being up to show our own change
+        setTrades((prev) => upsertTrade(prev, res.data));
         setResult("Trade scheduled");
         setQuantity("");
         setPrice("");
         setExecuteAt("");
-        fetchTrades();
       } else {
         setResult(`Error: ${res.error}`);
       }
@@ -259,8 +283,8 @@ function ScheduleTradeSection() {
   const handleCancel = async (id: string) => {
     setCancelLoading(id);
     try {
-      await cancelScheduledTrade(id);
-      fetchTrades();
+      const res = await cancelScheduledTrade(id);
+      if (res.success) setTrades((prev) => upsertTrade(prev, res.data));
     } catch {
       /* ignore */
     }
@@ -643,7 +667,8 @@ function OrderHistorySection() {
   const [connected, setConnected] = useState(false);
   const [cancelLoading, setCancelLoading] = useState<string | null>(null);
   const [page, setPage] = useState(1);
-  const wsRef = useRef<WebSocket | null>(null);
+  const wsRef = useRef<LiveSocket | null>(null);
+  const pageRef = useRef(1);
 
   useEffect(() => {
     const ws = connectOrdersWS(
@@ -658,7 +683,10 @@ function OrderHistorySection() {
     );
     ws.onopen = () => {
       setConnected(true);
-      ws.send(JSON.stringify({ page: 1, size: ORDERS_PER_PAGE }));
+      // re-send the current page after a reconnect
+      ws.send(
+        JSON.stringify({ page: pageRef.current, size: ORDERS_PER_PAGE })
+      );
     };
     ws.onclose = () => setConnected(false);
     wsRef.current = ws;
@@ -668,6 +696,7 @@ function OrderHistorySection() {
   const changePage = (newPage: number) => {
     if (newPage < 1) return;
     setPage(newPage);
+    pageRef.current = newPage;
     if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
       wsRef.current.send(
         JSON.stringify({ page: newPage, size: ORDERS_PER_PAGE })
@@ -932,6 +961,180 @@ function OrderbookSection() {
 }
 
 // ─── Main Page ─────────────────────────────────────────────
+// ─── Price Chart (candles, live WS) ───────────────────────
+const TIMEFRAMES = ["1s", "1m", "5m", "1h"];
+const CHART_CANDLES = 120;
+const CHART_WIDTH = 960;
+const CHART_HEIGHT = 240;
+
+interface CandleColumns {
+  t: number[];
+  o: number[];
+  h: number[];
+  l: number[];
+  c: number[];
+}
+
+interface Candle {
+  t: number;
+  o: number;
+  h: number;
+  l: number;
+  c: number;
+}
+
+function toCandles(cols: CandleColumns): Candle[] {
+  return cols.t
+    .map((t, i) => ({
+      t,
+      o: cols.o[i],
+      h: cols.h[i],
+      l: cols.l[i],
+      c: cols.c[i],
+    }))
+    .slice(-CHART_CANDLES);
+}
+
+function CandleChartSection() {
+  const [timeframe, setTimeframe] = useState("1m");
+  const [candles, setCandles] = useState<Candle[]>([]);
+  const [connected, setConnected] = useState(false);
+
+  useEffect(() => {
+    let active = true;
+    setCandles([]);
+    // REST paints the chart at once; the socket then keeps it live
+    getCandles(timeframe, CHART_CANDLES)
+      .then((res) => {
+        if (active && res.success) setCandles(toCandles(res.data));
+      })
+      .catch(() => {
+        /* ignore */
+      });
+    const ws = connectCandlesWS(
+      timeframe,
+      (data: unknown) => {
+        const msg = data as {
+          success: boolean;
+          type: string;
+          timeframe: string;
+          data: CandleColumns | number[];
+        };
+        if (!msg.success || msg.timeframe !== timeframe) return;
+        setConnected(true);
+        if (msg.type === "snapshot") {
+          setCandles(toCandles(msg.data as CandleColumns));
+          return;
+        }
+        const [t, o, h, l, c] = msg.data as number[];
+        setCandles((prev) => {
+          const last = prev[prev.length - 1];
+          if (last && last.t > t) return prev;
+          const base = last && last.t === t ? prev.slice(0, -1) : prev;
+          return [...base, { t, o, h, l, c }].slice(-CHART_CANDLES);
+        });
+      },
+      () => setConnected(false)
+    );
+    ws.onopen = () => setConnected(true);
+    ws.onclose = () => setConnected(false);
+    return () => {
+      active = false;
+      ws.close();
+    };
+  }, [timeframe]);
+
+  const low = Math.min(...candles.map((c) => c.l));
+  const high = Math.max(...candles.map((c) => c.h));
+  const range = high - low || 1;
+  const step = CHART_WIDTH / CHART_CANDLES;
+  const offset = CHART_CANDLES - candles.length;
+  const y = (p: number) => ((high - p) / range) * CHART_HEIGHT;
+  const last = candles[candles.length - 1];
+
+  return (
+    <Card className="border-[#262626]">
+      <CardHeader className="pb-3 flex flex-row items-center justify-between">
+        <div className="flex items-center gap-3">
+          <CardTitle className="text-sm uppercase tracking-widest text-[#737373]">
+            Price
+          </CardTitle>
+          {last && (
+            <span
+              className={`font-mono text-sm ${
+                last.c >= last.o ? "text-emerald-400" : "text-red-400"
+              }`}
+            >
+              {last.c.toFixed(4)}
+            </span>
+          )}
+        </div>
+        <div className="flex items-center gap-2">
+          {TIMEFRAMES.map((tf) => (
+            <Button
+              key={tf}
+              variant="outline"
+              size="sm"
+              onClick={() => setTimeframe(tf)}
+              className={`text-xs h-6 ${
+                tf === timeframe
+                  ? "border-white text-white"
+                  : "border-[#262626] text-[#737373] hover:text-white"
+              }`}
+            >
+              {tf}
+            </Button>
+          ))}
+          <div
+            className={`w-2 h-2 rounded-full ${
+              connected ? "bg-emerald-500" : "bg-red-500"
+            }`}
+          />
+          <span className="text-xs text-[#737373]">
+            {connected ? "LIVE" : "OFF"}
+          </span>
+        </div>
+      </CardHeader>
+      <CardContent>
+        {candles.length === 0 ? (
+          <p className="text-xs text-[#737373]">No candles yet</p>
+        ) : (
+          <svg
+            viewBox={`0 0 ${CHART_WIDTH} ${CHART_HEIGHT}`}
+            preserveAspectRatio="none"
+            className="w-full h-60"
+          >
+            {candles.map((c, i) => {
+              const x = (offset + i) * step;
+              const color = c.c >= c.o ? "#10b981" : "#ef4444";
+              const top = y(Math.max(c.o, c.c));
+              return (
+                <g key={c.t}>
+                  <line
+                    x1={x + step / 2}
+                    x2={x + step / 2}
+                    y1={y(c.h)}
+                    y2={y(c.l)}
+                    stroke={color}
+                    vectorEffect="non-scaling-stroke"
+                  />
+                  <rect
+                    x={x + step * 0.2}
+                    y={top}
+                    width={step * 0.6}
+                    height={Math.max(y(Math.min(c.o, c.c)) - top, 1)}
+                    fill={color}
+                  />
+                </g>
+              );
+            })}
+          </svg>
+        )}
+      </CardContent>
+    </Card>
+  );
+}
+
 export default function Home() {
   return (
     <main className="min-h-screen bg-black p-4 md:p-8">
@@ -955,6 +1158,9 @@ export default function Home() {
           <OrderbookSection />
         </div>
 
+        {/* price chart (live) */}
+        <CandleChartSection />
+
         {/* schedule trade */}
         <ScheduleTradeSection />
 
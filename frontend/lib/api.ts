@@ -71,11 +71,6 @@ export async function scheduleTrade(data: {
   return res.json();
 }
 
-export async function getScheduledTrades() {
-  const res = await fetch(`${API}/api/schedule`);
-  return res.json();
-}
-
 export async function cancelScheduledTrade(tradeId: string) {
   const res = await fetch(`${API}/api/schedule/${tradeId}`, {
     method: "DELETE",
@@ -83,43 +78,115 @@ export async function cancelScheduledTrade(tradeId: string) {
   return res.json();
 }
 
+// --- Candles ---
+
+export async function getCandles(timeframe = "1m", limit = 500) {
+  const res = await fetch(
+    `${API}/api/candles?timeframe=${timeframe}&limit=${limit}`
+  );
+  return res.json();
+}
+
 // --- WebSocket connectors ---
 
+// Sockets reconnect with exponential backoff. The server drops slow or stuck
+// clients (close code 1013), and the backend may restart.
+const RECONNECT_MIN_MS = 500;
+const RECONNECT_MAX_MS = 10000;
+
+export interface LiveSocket {
+  onopen: (() => void) | null;
+  onclose: (() => void) | null;
+  readonly readyState: number;
+  send(data: string): void;
+  close(): void;
+}
+
 function createWS(
   path: string,
   onMessage: (data: unknown) => void,
   onError?: (err: Event) => void
-): WebSocket {
-  const ws = new WebSocket(`ws://localhost:8000${path}`);
-  ws.onmessage = (event) => {
-    try {
-      const parsed = JSON.parse(event.data);
-      onMessage(parsed);
-    } catch {
-      onMessage(event.data);
-    }
+): LiveSocket {
+  let ws: WebSocket;
+  let delay = RECONNECT_MIN_MS;
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  let stopped = false;
+
+  const handle: LiveSocket = {
+    onopen: null,
+    onclose: null,
+    get readyState() {
+      return ws.readyState;
+    },
+    send(data: string) {
+      if (ws.readyState === WebSocket.OPEN) ws.send(data);
+    },
+    close() {
+      stopped = true;
+      if (timer) clearTimeout(timer);
+      ws.close();
+    },
+  };
+
+  const connect = () => {
+    ws = new WebSocket(`ws://localhost:8000${path}`);
+    ws.onopen = () => {
+      delay = RECONNECT_MIN_MS;
+      handle.onopen?.();
+    };
+    ws.onmessage = (event) => {
+      try {
+        const parsed = JSON.parse(event.data);
+        onMessage(parsed);
+      } catch {
+        onMessage(event.data);
+      }
+    };
+    if (onError) ws.onerror = onError;
+    ws.onclose = () => {
+      handle.onclose?.();
+      if (stopped) return;
+      timer = setTimeout(connect, delay);
+      delay = Math.min(delay * 2, RECONNECT_MAX_MS);
+    };
   };
-  if (onError) ws.onerror = onError;
-  return ws;
+
+  connect();
+  return handle;
 }
 
 export function connectPositionsWS(
   onMessage: (data: unknown) => void,
   onError?: (err: Event) => void
-): WebSocket {
+): LiveSocket {
   return createWS("/ws/positions", onMessage, onError);
 }
 
 export function connectOrderbookWS(
   onMessage: (data: unknown) => void,
   onError?: (err: Event) => void
-): WebSocket {
+): LiveSocket {
   return createWS("/ws/orderbook", onMessage, onError);
 }
 
 export function connectOrdersWS(
   onMessage: (data: unknown) => void,
   onError?: (err: Event) => void
-): WebSocket {
+): LiveSocket {
   return createWS("/ws/orders", onMessage, onError);
 }
+
+export function connectScheduleWS(
+  onMessage: (data: unknown) => void,
+  onError?: (err: Event) => void
+): LiveSocket {
+  return createWS("/ws/schedule", onMessage, onError);
+}
+
+export function connectCandlesWS(
+  timeframe: string,
+  onMessage: (data: unknown) => void,
+  onError?: (err: Event) => void
+): LiveSocket {
+  return createWS(`/ws/candles?timeframe=${timeframe}`, onMessage, onError);
+}